@@ -6,19 +6,27 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import re
+    from collections import OrderedDict
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
+    from .proxy_lib import ProxiedURL
 
-@dataclass
+
+@dataclass(slots=True)
 class DynamicProxiedURL:
     """A proxied URL."""
 
     url_pattern: str
+    url_regex: re.Pattern[str]
     ssl_verification: bool
     ssl_ciphers: str
     open_limit: int
-    expiration: int
+
+    # 0 for no expiration.
+    monotonic_expiration: float
 
 
 type HASSProxyConfigEntry = ConfigEntry[HASSProxyData]
@@ -30,3 +38,19 @@ class HASSProxyData:
 
     integration: Integration
     dynamic_proxied_urls: dict[str, DynamicProxiedURL]
+
+    # Dynamic URL patterns without wildcards, mapped to their url_id.
+    literal_urls: dict[str, str]
+
+    # Min-heap of (expiration, url_id) for dynamic proxied URLs with a TTL.
+    expiry_heap: list[tuple[float, str]]
+
+    # Recently expired dynamic proxied URLs (oldest first), kept so that
+    # matching requests are told the URL has expired rather than not found.
+    expired_proxied_urls: OrderedDict[str, DynamicProxiedURL]
+
+    url_patterns_regex: re.Pattern[str] | None
+
+    # LRU of url -> (ProxiedURL, expiration) for results that can be reused
+    # across requests. Cleared whenever dynamic proxied URLs change.
+    proxied_url_cache: OrderedDict[str, tuple[ProxiedURL, float]]
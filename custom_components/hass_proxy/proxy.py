@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import heapq
+import re
+import secrets
 import time
-import urllib
-import uuid
-from typing import TYPE_CHECKING, Any
+from collections import OrderedDict
+from typing import TYPE_CHECKING
 
-import urlmatch
 import voluptuous as vol
 from homeassistant.core import callback
 from homeassistant.exceptions import ServiceValidationError
@@ -19,6 +20,7 @@ from homeassistant.util.ssl import (
     client_context,
     client_context_no_verify,
 )
+from urlmatch.urlmatch import BadMatchPattern, parse_match_pattern
 
 from custom_components.hass_proxy.const import DOMAIN
 from custom_components.hass_proxy.data import (
@@ -41,13 +43,15 @@ from .const import (
     CONF_SSL_CIPHERS_INTERMEDIATE,
     CONF_SSL_CIPHERS_MODERN,
     CONF_SSL_VERIFICATION,
+    CONF_URL_PATTERNS,
+    LOGGER,
     SERVICE_CREATE_PROXIED_URL,
     SERVICE_DELETE_PROXIED_URL,
 )
 
 if TYPE_CHECKING:
     import ssl
-    from types import MappingProxyType
+    from collections.abc import Iterable
 
     import aiohttp
     from aiohttp import web
@@ -60,12 +64,14 @@ CREATE_PROXIED_URL_SCHEMA = vol.Schema(
         vol.Required("url_pattern"): cv.string,
         vol.Optional("url_id"): cv.string,
         vol.Optional("ssl_verification", default=True): cv.boolean,
-        vol.Optional("ssl_ciphers", default=CONF_SSL_CIPHERS_DEFAULT): vol.Any(
-            None,
-            CONF_SSL_CIPHERS_INSECURE,
-            CONF_SSL_CIPHERS_MODERN,
-            CONF_SSL_CIPHERS_INTERMEDIATE,
-            CONF_SSL_CIPHERS_DEFAULT,
+        vol.Optional("ssl_ciphers", default=CONF_SSL_CIPHERS_DEFAULT): vol.In(
+            {
+                None,
+                CONF_SSL_CIPHERS_INSECURE,
+                CONF_SSL_CIPHERS_MODERN,
+                CONF_SSL_CIPHERS_INTERMEDIATE,
+                CONF_SSL_CIPHERS_DEFAULT,
+            }
         ),
         vol.Optional("open_limit", default=1): cv.positive_int,
         vol.Optional("time_to_live", default=60): cv.positive_int,
@@ -80,6 +86,16 @@ DELETE_PROXIED_URL_SCHEMA = vol.Schema(
     required=True,
 )
 
+PROXIED_URL_CACHE_SIZE = 256
+EXPIRED_PROXIED_URLS_SIZE = 256
+
+_SSL_CIPHERS_TO_HA_SSL_CIPHERS: dict[str, SSLCipherList] = {
+    CONF_SSL_CIPHERS_DEFAULT: SSLCipherList.PYTHON_DEFAULT,
+    CONF_SSL_CIPHERS_MODERN: SSLCipherList.MODERN,
+    CONF_SSL_CIPHERS_INTERMEDIATE: SSLCipherList.INTERMEDIATE,
+    CONF_SSL_CIPHERS_INSECURE: SSLCipherList.INSECURE,
+}
+
 
 class HASSProxyError(Exception):
     """Exception to indicate a general Proxy error."""
@@ -89,7 +105,59 @@ class HASSProxyURLIDNotFoundError(HASSProxyError):
     """Exception to indicate that a URL ID was not found."""
 
 
-@callback
+def _url_pattern_to_regex(url_pattern: str) -> str:
+    """Convert a (possibly comma-separated) urlmatch pattern to a regex."""
+    return "|".join(
+        parse_match_pattern(pattern.strip(), path_required=False)
+        for pattern in url_pattern.split(",")
+    )
+
+
+def _compile_url_patterns(url_patterns: Iterable[str]) -> re.Pattern[str] | None:
+    """Compile urlmatch patterns into a single regex, skipping invalid ones."""
+    regexes = []
+    for url_pattern in url_patterns:
+        try:
+            regexes.append(_url_pattern_to_regex(url_pattern))
+        except BadMatchPattern:
+            LOGGER.warning("Ignoring invalid URL pattern: %s", url_pattern)
+    return re.compile("|".join(regexes)) if regexes else None
+
+
+def _delete_dynamic_proxied_url(runtime_data: HASSProxyData, url_id: str) -> None:
+    """Delete a dynamic proxied URL (if present), whether expired or not."""
+    runtime_data.expired_proxied_urls.pop(url_id, None)
+    proxied_url = runtime_data.dynamic_proxied_urls.pop(url_id, None)
+    if proxied_url is not None:
+        _unindex_literal_url(runtime_data, url_id, proxied_url)
+
+
+def _unindex_literal_url(
+    runtime_data: HASSProxyData, url_id: str, proxied_url: DynamicProxiedURL
+) -> None:
+    """Remove a dynamic proxied URL from the literal URL index."""
+    if runtime_data.literal_urls.get(proxied_url.url_pattern) == url_id:
+        del runtime_data.literal_urls[proxied_url.url_pattern]
+
+
+def _index_literal_url(
+    runtime_data: HASSProxyData, url_id: str, proxied_url: DynamicProxiedURL
+) -> None:
+    """Add a dynamic proxied URL to the literal URL index, if safe to do so."""
+    url_pattern = proxied_url.url_pattern
+    if "*" in url_pattern or "," in url_pattern:
+        return
+
+    # Dynamic URLs match in creation order, so the fast path may only be used
+    # if no earlier dynamic URL would also match this exact URL.
+    for other_url_id, other_proxied_url in runtime_data.dynamic_proxied_urls.items():
+        if other_url_id == url_id:
+            break
+        if other_proxied_url.url_regex.search(url_pattern):
+            return
+    runtime_data.literal_urls[url_pattern] = url_id
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: HASSProxyConfigEntry) -> None:
     """Set up the proxy entry."""
     session = async_get_clientsession(hass)
@@ -98,33 +166,85 @@ async def async_setup_entry(hass: HomeAssistant, entry: HASSProxyConfigEntry) ->
     entry.runtime_data = HASSProxyData(
         integration=async_get_loaded_integration(hass, entry.domain),
         dynamic_proxied_urls={},
+        literal_urls={},
+        expiry_heap=[],
+        expired_proxied_urls=OrderedDict(),
+        url_patterns_regex=_compile_url_patterns(
+            entry.options.get(CONF_URL_PATTERNS, [])
+        ),
+        proxied_url_cache=OrderedDict(),
     )
 
+    @callback
     def create_proxied_url(call: ServiceCall) -> None:
         """Create a proxied URL."""
-        url_id = call.data.get("url_id") or str(uuid.uuid4())
+        url_id = call.data.get("url_id") or secrets.token_hex(16)
+        url_pattern = call.data["url_pattern"].strip()
         ttl = call.data["time_to_live"]
 
-        entry.runtime_data.dynamic_proxied_urls[url_id] = DynamicProxiedURL(
-            url_pattern=call.data["url_pattern"],
+        try:
+            url_regex = re.compile(_url_pattern_to_regex(url_pattern))
+        except BadMatchPattern as exc:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="invalid_url_pattern",
+                translation_placeholders={"url_pattern": url_pattern},
+            ) from exc
+
+        runtime_data = entry.runtime_data
+        runtime_data.expired_proxied_urls.pop(url_id, None)
+        runtime_data.proxied_url_cache.clear()
+        now = time.monotonic()
+
+        previous_proxied_url = runtime_data.dynamic_proxied_urls.get(url_id)
+        if (
+            previous_proxied_url is not None
+            and previous_proxied_url.monotonic_expiration
+            and previous_proxied_url.monotonic_expiration < now
+        ):
+            # Re-creating an expired URL always moves it to the end of the
+            # match order, whether or not a request has removed it yet.
+            _delete_dynamic_proxied_url(runtime_data, url_id)
+        elif previous_proxied_url is not None:
+            _unindex_literal_url(runtime_data, url_id, previous_proxied_url)
+
+            # A replaced URL keeps its (possibly earlier) position, so it may
+            # now take precedence over literal URLs indexed after it.
+            for literal_url in list(runtime_data.literal_urls):
+                if url_regex.search(literal_url):
+                    del runtime_data.literal_urls[literal_url]
+
+        expiration = now + ttl if ttl else 0
+        proxied_url = DynamicProxiedURL(
+            url_pattern=url_pattern,
+            url_regex=url_regex,
             ssl_verification=call.data["ssl_verification"],
             ssl_ciphers=call.data["ssl_ciphers"],
             open_limit=call.data["open_limit"],
-            expiration=time.time() + ttl if ttl else 0,
+            monotonic_expiration=expiration,
         )
+        runtime_data.dynamic_proxied_urls[url_id] = proxied_url
+        _index_literal_url(runtime_data, url_id, proxied_url)
+        if expiration:
+            heapq.heappush(runtime_data.expiry_heap, (expiration, url_id))
 
+    @callback
     def delete_proxied_url(call: ServiceCall) -> None:
         """Delete a proxied URL."""
         url_id = call.data["url_id"]
         dynamic_proxied_urls = entry.runtime_data.dynamic_proxied_urls
 
-        if url_id not in dynamic_proxied_urls:
+        if (
+            url_id not in dynamic_proxied_urls
+            and url_id not in entry.runtime_data.expired_proxied_urls
+        ):
             raise ServiceValidationError(
                 translation_domain=DOMAIN,
                 translation_key="url_id_not_found",
                 translation_placeholders={"url_id": url_id},
             )
-        del entry.runtime_data.dynamic_proxied_urls[url_id]
+        _delete_dynamic_proxied_url(entry.runtime_data, url_id)
+        entry.runtime_data.proxied_url_cache.clear()
 
     if entry.options.get(CONF_DYNAMIC_URLS):
         hass.services.async_register(
@@ -141,7 +261,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: HASSProxyConfigEntry) ->
         )
 
 
-@callback
 async def async_unload_entry(hass: HomeAssistant, entry: HASSProxyConfigEntry) -> None:
     """Unload the proxy entry."""
     if entry.options.get(CONF_DYNAMIC_URLS):
@@ -161,79 +280,159 @@ class HAProxyView(ProxyView):
         """Get the config entry."""
         return self._hass.config_entries.async_entries(DOMAIN)[0]
 
-    def get_dynamic_proxied_urls(self) -> dict[str, DynamicProxiedURL]:
-        """Get the dynamic proxied URLs."""
-        return self._get_config_entry().runtime_data.dynamic_proxied_urls
+    def _expire_dynamic_proxied_urls(self, runtime_data: HASSProxyData) -> None:
+        """Move expired dynamic proxied URLs into the expired set."""
+        expiry_heap = runtime_data.expiry_heap
+        proxied_urls = runtime_data.dynamic_proxied_urls
+        expired_proxied_urls = runtime_data.expired_proxied_urls
+        now = time.monotonic()
+
+        while expiry_heap and expiry_heap[0][0] < now:
+            expiration, url_id = heapq.heappop(expiry_heap)
+            proxied_url = proxied_urls.get(url_id)
+
+            # Skip heap entries for URLs already deleted or since replaced.
+            if proxied_url is None or proxied_url.monotonic_expiration != expiration:
+                continue
+
+            _delete_dynamic_proxied_url(runtime_data, url_id)
+            expired_proxied_urls[url_id] = proxied_url
+            if len(expired_proxied_urls) > EXPIRED_PROXIED_URLS_SIZE:
+                expired_proxied_urls.popitem(last=False)
+
+    def _open_dynamic_proxied_url(
+        self,
+        runtime_data: HASSProxyData,
+        url_id: str,
+        url_to_proxy: str,
+    ) -> ProxiedURL:
+        """Open a dynamic proxied URL, honoring its open limit."""
+        proxied_url = runtime_data.dynamic_proxied_urls[url_id]
+        if proxied_url.open_limit:
+            proxied_url.open_limit -= 1
+            if proxied_url.open_limit == 0:
+                _delete_dynamic_proxied_url(runtime_data, url_id)
+            return self._build_proxied_url(
+                url_to_proxy,
+                proxied_url.ssl_ciphers,
+                ssl_verification=proxied_url.ssl_verification,
+            )
+
+        # Only URLs without an open limit may be served from the cache, as
+        # every open of a limited URL must be counted.
+        return self._build_proxied_url(
+            url_to_proxy,
+            proxied_url.ssl_ciphers,
+            ssl_verification=proxied_url.ssl_verification,
+            cache=runtime_data.proxied_url_cache,
+            expiration=proxied_url.monotonic_expiration,
+        )
 
-    def _get_options(self) -> MappingProxyType[str, Any]:
-        """Get a ConfigEntry options for a given request."""
-        return self._get_config_entry().options
+    def _build_proxied_url(
+        self,
+        url_to_proxy: str,
+        ssl_ciphers: HASSProxySSLCiphers,
+        *,
+        ssl_verification: bool,
+        cache: OrderedDict[str, tuple[ProxiedURL, float]] | None = None,
+        expiration: float = 0,
+    ) -> ProxiedURL:
+        """Build a ProxiedURL, optionally adding it to the cache."""
+        proxied_url = ProxiedURL(
+            url=url_to_proxy,
+            ssl_context=self._get_ssl_context(
+                ssl_ciphers, ssl_verification=ssl_verification
+            ),
+        )
+        if cache is not None:
+            cache[url_to_proxy] = (proxied_url, expiration)
+            if len(cache) > PROXIED_URL_CACHE_SIZE:
+                cache.popitem(last=False)
+        return proxied_url
+
+    def _get_cached_proxied_url(
+        self, runtime_data: HASSProxyData, url_to_proxy: str
+    ) -> ProxiedURL | None:
+        """Get a still-valid ProxiedURL from the cache."""
+        cache = runtime_data.proxied_url_cache
+        cached = cache.get(url_to_proxy)
+        if cached is None:
+            return None
+
+        proxied_url, expiration = cached
+        if expiration and expiration < time.monotonic():
+            del cache[url_to_proxy]
+            return None
+
+        cache.move_to_end(url_to_proxy)
+        return proxied_url
 
     def _get_proxied_url(self, request: web.Request) -> ProxiedURL:
         """Get the URL to proxy."""
-        if "url" not in request.query:
+        # aiohttp has already percent-decoded query values.
+        url_to_proxy = request.query.get("url")
+        if url_to_proxy is None:
             raise HASSProxyLibNotFoundRequestError
 
-        options = self._get_options()
-        url_to_proxy = urllib.parse.unquote(request.query["url"])
-        has_expired_match = False
+        # Look the entry up on each request: views cannot be unregistered, so
+        # this view outlives any entry that is removed and added again.
+        entry = self._get_config_entry()
+        options = entry.options
+        runtime_data = entry.runtime_data
+
+        cached_proxied_url = self._get_cached_proxied_url(runtime_data, url_to_proxy)
+        if cached_proxied_url is not None:
+            return cached_proxied_url
+
+        self._expire_dynamic_proxied_urls(runtime_data)
+
+        matched_url_id = runtime_data.literal_urls.get(url_to_proxy)
+        if matched_url_id is None and runtime_data.dynamic_proxied_urls:
+            matched_url_id = next(
+                (
+                    url_id
+                    for url_id, proxied_url in runtime_data.dynamic_proxied_urls.items()
+                    if proxied_url.url_regex.search(url_to_proxy)
+                ),
+                None,
+            )
+        if matched_url_id is not None:
+            return self._open_dynamic_proxied_url(
+                runtime_data, matched_url_id, url_to_proxy
+            )
 
-        proxied_urls = self.get_dynamic_proxied_urls()
-        for [url_id, proxied_url] in proxied_urls.items():
-            if urlmatch.urlmatch(
-                proxied_url.url_pattern,
+        url_patterns_regex = runtime_data.url_patterns_regex
+        if url_patterns_regex and url_patterns_regex.search(url_to_proxy):
+            ssl_cipher = options.get(CONF_SSL_CIPHERS)
+            ssl_verification = options.get(CONF_SSL_VERIFICATION, True)
+
+            return self._build_proxied_url(
                 url_to_proxy,
-                path_required=False,
-            ):
-                if proxied_url.expiration and proxied_url.expiration < time.time():
-                    has_expired_match = True
-                    continue
-
-                if proxied_url.open_limit:
-                    proxied_url.open_limit -= 1
-                    if proxied_url.open_limit == 0:
-                        del proxied_urls[url_id]
-
-                return ProxiedURL(
-                    url=url_to_proxy,
-                    ssl_context=self._get_ssl_context(proxied_url.ssl_ciphers)
-                    if proxied_url.ssl_verification
-                    else self._get_ssl_context_no_verify(proxied_url.ssl_ciphers),
-                )
-
-        for url_pattern in self._get_options().get("url_patterns", []):
-            if urlmatch.urlmatch(url_pattern, url_to_proxy, path_required=False):
-                ssl_cipher = options.get(CONF_SSL_CIPHERS)
-                ssl_verification = options.get(CONF_SSL_VERIFICATION, True)
-
-                return ProxiedURL(
-                    url=url_to_proxy,
-                    ssl_context=self._get_ssl_context(ssl_cipher)
-                    if ssl_verification
-                    else self._get_ssl_context_no_verify(ssl_cipher),
-                )
-
-        if has_expired_match:
+                ssl_cipher,
+                ssl_verification=ssl_verification,
+                cache=runtime_data.proxied_url_cache,
+            )
+
+        if any(
+            proxied_url.url_regex.search(url_to_proxy)
+            for proxied_url in runtime_data.expired_proxied_urls.values()
+        ):
             raise HASSProxyLibExpiredError
         raise HASSProxyLibNotFoundRequestError
 
-    def _get_ssl_context_no_verify(
-        self, ssl_cipher: HASSProxySSLCiphers
+    def _get_ssl_context(
+        self, ssl_ciphers: HASSProxySSLCiphers, *, ssl_verification: bool
     ) -> ssl.SSLContext:
         """Get an SSL context."""
-        return client_context_no_verify(
-            self._proxy_ssl_cipher_to_ha_ssl_cipher(ssl_cipher)
+        # Unset ciphers (None) fall back to the Python default.
+        ha_ssl_ciphers = _SSL_CIPHERS_TO_HA_SSL_CIPHERS.get(
+            ssl_ciphers, SSLCipherList.PYTHON_DEFAULT
+        )
+        return (
+            client_context(ha_ssl_ciphers)
+            if ssl_verification
+            else client_context_no_verify(ha_ssl_ciphers)
         )
-
-    def _get_ssl_context(self, ssl_ciphers: HASSProxySSLCiphers) -> ssl.SSLContext:
-        """Get an SSL context."""
-        return client_context(self._proxy_ssl_cipher_to_ha_ssl_cipher(ssl_ciphers))
-
-    def _proxy_ssl_cipher_to_ha_ssl_cipher(self, ssl_ciphers: str) -> SSLCipherList:
-        """Convert a proxy SSL cipher to a HA SSL cipher."""
-        if ssl_ciphers == CONF_SSL_CIPHERS_DEFAULT:
-            return SSLCipherList.PYTHON_DEFAULT
-        return ssl_ciphers
 
 
 class V0ProxyView(HAProxyView):
@@ -48,7 +48,7 @@ class HASSProxyLibExpiredError(HASSProxyLibError):
 #  - https://github.com/blakeblackshear/frigate-hass-integration/blob/master/custom_components/frigate/views.py
 
 
-@dataclass
+@dataclass(slots=True)
 class ProxiedURL:
     """A proxied URL."""
 